@@ -1,24 +1,27 @@
 import base64
+import contextlib
+import functools
 import getpass
 import http.client
 import itertools
 import orjson
 import logging
-import math
+import mmap
 import os
 import ssl
 import string
 import subprocess
 import sys
+import threading
 import time
-import urllib
 import urllib.parse
-import urllib.request
 
 # -------------------------------- Constants --------------------------------- #
 
 DEFAULT_PORT = 6800
 SERVER_URI_FORMAT = "{}://{}:{:d}/jsonrpc"
+# Default socket timeout for RPC requests, in seconds.
+DEFAULT_TIMEOUT = 60
 
 # Status values for unfinished downloads.
 TEMPORARY_STATUS = ("active", "waiting", "paused")
@@ -27,6 +30,15 @@ FINAL_STATUS = ("complete", "error")
 
 ARIA2_CONTROL_FILE_EXT = ".aria2"
 
+# Keys requested by get_statuses.
+STATUS_KEYS = ["gid", "status"]
+# Maximum number of methods sent in one system.multicall.
+MULTICALL_CHUNK_SIZE = 512
+# Maximum number of cached status_multicall request bodies.
+STATUS_BODIES_MAX_LEN = 16
+# Approximate maximum request body size of one enqueuing system.multicall.
+MULTICALL_MAX_BYTES = 4 * 1024 * 1024
+
 # Encoding to use when inserting bytes objects into JSON.
 JSON_ENCODING = "utf-8"
 
@@ -41,11 +53,11 @@ def to_json_list(objs):
     """
     Wrap strings in lists. Other iterables are converted to lists directly.
     """
+    if type(objs) is list:
+        return objs
     if isinstance(objs, str):
         return [objs]
-    if not isinstance(objs, list):
-        return list(objs)
-    return objs
+    return list(objs)
 
 
 def add_options_and_position(params, options=None, position=None):
@@ -55,16 +67,26 @@ def add_options_and_position(params, options=None, position=None):
     if options:
         params.append(options)
     if position:
-        if not isinstance(position, int):
+        if type(position) is not int:
             try:
                 position = int(position)
             except ValueError:
-                position = -1
+                return params
         if position >= 0:
             params.append(position)
     return params
 
 
+def status_methods(gids):
+    """
+    Build the multicall methods that query the status of the GIDs.
+    """
+    return [
+        {"methodName": "aria2.tellStatus", "params": [gid, STATUS_KEYS]}
+        for gid in gids
+    ]
+
+
 def get_status(response):
     """
     Process a status response.
@@ -80,6 +102,68 @@ def get_status(response):
         return "error"
 
 
+@functools.lru_cache(maxsize=8)
+def b64encode_file_cached(path, mtime_ns, size):
+    """
+    Read a file into a base64-encoded string. The modification time and size
+    are part of the cache key so that changed files are read again.
+    """
+    if size == 0:
+        return ""
+    with open(path, "rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return base64.b64encode(data).decode(JSON_ENCODING)
+
+
+@functools.lru_cache(maxsize=8)
+def get_ssl_context(
+    server_cert=None, client_cert=None, client_cert_password=None, protocol=None
+):
+    """
+    Get an SSL context for HTTPS connections with optional server and client
+    certificates. Contexts are shared between instances with the same settings.
+    """
+    if not protocol:
+        protocol = ssl.PROTOCOL_TLS_CLIENT
+    context = ssl.SSLContext(protocol)
+    # Version-specific protocols such as PROTOCOL_TLSv1 fix the version and
+    # reject a minimum.
+    if protocol in (ssl.PROTOCOL_TLS_CLIENT, ssl.PROTOCOL_TLS):
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.check_hostname = False
+
+    if server_cert:
+        context.verify_mode = ssl.CERT_REQUIRED
+        context.load_verify_locations(cafile=server_cert)
+    else:
+        context.verify_mode = ssl.CERT_OPTIONAL
+
+    if client_cert:
+        context.load_cert_chain(client_cert, password=client_cert_password)
+    return context
+
+
+def backoff_delays(interval, initial=0.1, factor=1.5):
+    """
+    Yield polling delays that grow exponentially from `initial` up to
+    `interval`.
+    """
+    delay = min(initial, interval)
+    while True:
+        yield delay
+        delay = min(delay * factor, interval)
+
+
+def get_result(obj):
+    """
+    Extract the result from a JSON-RPC response object.
+    """
+    try:
+        return obj["result"]
+    except KeyError:
+        raise Aria2JsonRpcError("unexpected result: {}".format(obj))
+
+
 def random_token(length, valid_chars=None):
     """
     Get a random secret token for the Aria2 RPC server.
@@ -95,19 +179,40 @@ def random_token(length, valid_chars=None):
     if not valid_chars:
         valid_chars = string.ascii_letters + string.digits + "!@#$%^&*()-_=+"
     number_of_chars = len(valid_chars)
-    bytes_to_read = math.ceil(math.log(number_of_chars) / math.log(0x100))
-    max_value = 0x100**bytes_to_read
-    max_index = number_of_chars - 1
-    token = ""
-    for _ in range(length):
-        value = int.from_bytes(os.urandom(bytes_to_read), byteorder="little")
-        index = round((value * max_index) / max_value)
-        token += valid_chars[index]
-    return token
+    if number_of_chars == 1:
+        return valid_chars[0] * length
+    # Mask random values to the smallest power of two that covers all indices
+    # and reject the ones out of range so that every character is equally
+    # likely.
+    bits = (number_of_chars - 1).bit_length()
+    mask = (1 << bits) - 1
+    bytes_to_read = (bits + 7) // 8
+    chars = []
+    while len(chars) < length:
+        # Read about twice as many bytes as needed, as up to half of the values
+        # can be rejected.
+        data = os.urandom(2 * (length - len(chars)) * bytes_to_read)
+        if bytes_to_read == 1:
+            values = data
+        else:
+            values = (
+                int.from_bytes(data[i : i + bytes_to_read], byteorder="little")
+                for i in range(0, len(data), bytes_to_read)
+            )
+        chars.extend(
+            valid_chars[index]
+            for index in (value & mask for value in values)
+            if index < number_of_chars
+        )
+    return "".join(chars[:length])
 
 
 # ---------------- From python3-aur's ThreadedServers.common ----------------- #
 
+BYTE_PREFIXES = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB", "YiB")
+BYTE_SCALES = tuple(1 << (10 * i) for i in range(len(BYTE_PREFIXES)))
+
+
 
 def format_bytes(size):
     """
@@ -115,26 +220,28 @@ def format_bytes(size):
     """
     if size < 0x400:
         return "{:d} B".format(size)
-    size = float(size) / 0x400
-    for prefix in ("KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB"):
-        if size < 0x400:
-            return "{:0.02f} {}".format(size, prefix)
-        size /= 0x400
-    return "{:0.02f} YiB".format(size)
+    # Each prefix covers 10 bits of the size.
+    index = min((int(size).bit_length() - 1) // 10, len(BYTE_PREFIXES) - 1)
+    return "{:0.02f} {}".format(size / BYTE_SCALES[index], BYTE_PREFIXES[index])
 
 
 def format_seconds(seconds):
     """
     Convert seconds to hours, minutes and seconds.
     """
+    days, seconds = divmod(int(seconds), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    # Leading zero fields are dropped, as are zero fields after the first.
+    fields = ((days, "d"), (hours, "h"), (minutes, "m"), (seconds, "s"))
     time_str = ""
-    for base, char in ((60, "s"), (60, "m"), (24, "h")):
-        seconds, remainder = divmod(seconds, base)
-        if seconds == 0:
-            return "{:d}{}{}".format(remainder, char, time_str)
-        if remainder != 0:
-            time_str = "{:02d}{}{}".format(remainder, char, time_str)
-    return "{:d}d{}".format(seconds, string)
+    for value, char in fields:
+        if time_str:
+            if value:
+                time_str += "{:02d}{}".format(value, char)
+        elif value or char == "s":
+            time_str = "{:d}{}".format(value, char)
+    return time_str
 
 
 # --------------------------------- FakeLock --------------------------------- #
@@ -152,6 +259,26 @@ class FakeLock:
         return
 
 
+# --------------------------------- LazyJson --------------------------------- #
+
+
+class LazyJson:
+    """
+    Pretty-print an object as JSON only when it is converted to a string, e.g.
+    when a log record is actually emitted.
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return orjson.dumps(
+            self.obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        ).decode()
+
+
 # ---------------------------- Aria2JsonRpcError ----------------------------- #
 
 
@@ -378,13 +505,14 @@ class Aria2RpcServer(object):
                 else:
                     self.process = subprocess.Popen(self.cmd, stdout=sys.stderr)
             timeout = time.time() + self.timeout
+            delays = backoff_delays(0.25, initial=0.005, factor=1.6)
             # Wait for the server to start listening.
             while True:
                 try:
                     self.a2jr.getVersion()
                 except Aria2JsonRpcError as err:
                     if err.connection_error:
-                        time.sleep(0.25)
+                        time.sleep(next(delays))
                         if time.time() > timeout:
                             break
                     else:
@@ -401,9 +529,11 @@ class Aria2RpcServer(object):
 
     def __exit__(self, exc_type, exc_value, traceback):
         """
-        Invokes kill()
+        Invokes kill() and closes the connection to the server.
         """
         self.kill()
+        if self.a2jr is not None:
+            self.a2jr.close()
 
 
 # ---------------------------- Aria2JsonRpc Class ---------------------------- #
@@ -416,6 +546,9 @@ class Aria2JsonRpc(object):
 
     # TODO: certificate options, etc.
 
+    # Fully qualified method names, keyed by (prefix, method).
+    METHOD_NAMES = dict()
+
     def __init__(
         self,
         identity,
@@ -429,6 +562,7 @@ class Aria2JsonRpc(object):
         client_cert_password=None,
         ssl_protocol=None,
         setup_function=None,
+        timeout=DEFAULT_TIMEOUT,
     ):
         """
         identity: the identity to send to the RPC interface
@@ -462,15 +596,27 @@ class Aria2JsonRpc(object):
           A function to invoke prior to the first server call. This could be the
           launch() method of an Aria2RpcServer instance, for example. This attribute
           is set automatically in instances returned from Aria2RpcServer.get_a2jr()
+
+        timeout:
+          Socket timeout in seconds for requests to the RPC interface.
         """
         self.identity = identity
         self.uri = uri
         self.mode = mode
         self.queue = []
-        self.handlers = dict()
         self.token = token
         self.setup_function = setup_function
 
+        # The HTTP(S) connection is kept open and reused for every request.
+        # The lock serializes its use so that a request and its response are
+        # never interleaved with those of another thread.
+        self.url_parts = urllib.parse.urlsplit(uri)
+        self.connection = None
+        self.lock = threading.RLock()
+        self.timeout = timeout
+        self.ssl_context = None
+        self.headers = {"Content-Type": "application/json"}
+
         if None not in (http_user, http_passwd):
             self.add_HTTPBasicAuthHandler(http_user, http_passwd)
 
@@ -482,53 +628,69 @@ class Aria2JsonRpc(object):
                 protocol=ssl_protocol,
             )
 
-        self.update_opener()
-
-    def iter_handlers(self):
+    @property
+    def token(self):
         """
-        Iterate over handlers.
+        RPC method-level authorization token.
         """
-        for name in ("HTTPS", "HTTPBasicAuth"):
-            try:
-                yield self.handlers[name]
-            except KeyError:
-                pass
+        return self._token
 
-    def update_opener(self):
+    @token.setter
+    def token(self, token):
+        self._token = token
+        # Prefixed token inserted into the parameters of every request.
+        self.token_str = None if token is None else "token:{}".format(token)
+        # Request objects of no_param_jsonrpc() and the serialized requests of
+        # status_multicall() contain the token.
+        self.no_param_requests = dict()
+        self.status_bodies = dict()
+
+    def get_connection(self):
         """
-        Build an opener from the current handlers.
+        Get the persistent connection to the RPC interface, opening it if
+        necessary.
         """
-        self.opener = urllib.request.build_opener(*self.iter_handlers())
+        if self.connection is None:
+            host = self.url_parts.hostname
+            port = self.url_parts.port
+            if self.url_parts.scheme == "https":
+                self.connection = http.client.HTTPSConnection(
+                    host, port, timeout=self.timeout, context=self.ssl_context
+                )
+            else:
+                self.connection = http.client.HTTPConnection(
+                    host, port, timeout=self.timeout
+                )
+        return self.connection
 
-    def remove_handler(self, name):
+    def close(self):
         """
-        Remove a handler.
+        Close the persistent connection. It is reopened by the next request.
         """
-        try:
-            del self.handlers[name]
-        except KeyError:
-            pass
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
 
     def add_HTTPBasicAuthHandler(self, user, passwd):
         """
-        Add a handler for HTTP Basic authentication.
+        Add HTTP Basic authentication.
 
-        If either user or passwd are None, the handler is removed.
+        If either user or passwd are None, the authentication is removed.
         """
-        handler = urllib.request.HTTPBasicAuthHandler()
-        handler.add_password(
-            realm="aria2",
-            uri=self.uri,
-            user=user,
-            passwd=passwd,
-        )
-        self.handlers["HTTPBasicAuth"] = handler
+        if None in (user, passwd):
+            self.remove_HTTPBasicAuthHandler()
+            return
+        credentials = "{}:{}".format(user, passwd).encode(JSON_ENCODING)
+        self.headers["Authorization"] = "Basic " + base64.b64encode(
+            credentials
+        ).decode("ascii")
 
     def remove_HTTPBasicAuthHandler(self):
         """
-        Remove the HTTP Basic authentication handler.
+        Remove HTTP Basic authentication.
         """
-        self.remove_handler("HTTPBasicAuth")
+        self.headers.pop("Authorization", None)
 
     def add_HTTPSHandler(
         self,
@@ -538,91 +700,173 @@ class Aria2JsonRpc(object):
         protocol=None,
     ):
         """
-        Add a handler for HTTPS connections with optional server and client
+        Configure HTTPS connections with optional server and client
         certificates.
         """
-        if not protocol:
-            protocol = ssl.PROTOCOL_TLSv1
-        #       protocol = ssl.PROTOCOL_TLSv1_1 # openssl 1.0.1+
-        #       protocol = ssl.PROTOCOL_TLSv1_2 # Python 3.4+
-        context = ssl.SSLContext(protocol)
+        self.ssl_context = get_ssl_context(
+            server_cert, client_cert, client_cert_password, protocol
+        )
+        self.close()
 
-        if server_cert:
-            context.verify_mode = ssl.CERT_REQUIRED
-            context.load_verify_locations(cafile=server_cert)
-        else:
-            context.verify_mode = ssl.CERT_OPTIONAL
+    def remove_HTTPSHandler(self):
+        """
+        Remove the HTTPS configuration.
+        """
+        self.ssl_context = None
+        self.close()
+
+    def post(self, body):
+        """
+        POST a request body over the persistent connection and return the
+        response body. A connection that the server closed while idle is
+        reopened once.
+        """
+        path = self.url_parts.path or "/"
+        with self.lock:
+            reused = self.connection is not None
+            while True:
+                connection = self.get_connection()
+                try:
+                    connection.request("POST", path, body=body, headers=self.headers)
+                    response = connection.getresponse()
+                    data = response.read()
+                except (http.client.RemoteDisconnected, BrokenPipeError):
+                    self.close()
+                    if not reused:
+                        raise
+                    reused = False
+                    continue
+                except (OSError, http.client.HTTPException):
+                    self.close()
+                    raise
+                if response.will_close:
+                    self.close()
+                if response.status != 200:
+                    raise Aria2JsonRpcError(
+                        "HTTP Error {:d}: {}".format(response.status, response.reason)
+                    )
+                return data
 
-        if client_cert:
-            context.load_cert_chain(client_cert, password=client_cert_password)
+    @property
+    def setup_function(self):
+        """
+        Function to invoke prior to the next server call.
+        """
+        return self._setup_function
 
-        self.handlers["HTTPS"] = urllib.request.HTTPSHandler(
-            context=context, check_hostname=False
-        )
+    @setup_function.setter
+    def setup_function(self, setup_function):
+        self._setup_function = setup_function
+        # Route requests through setup_and_send_request until the setup has
+        # run, so that send_request itself never has to check for it.
+        if setup_function:
+            self.send_request = self.setup_and_send_request
+        else:
+            self.__dict__.pop("send_request", None)
 
-    def remove_HTTPSHandler(self):
+    def setup_and_send_request(self, req_obj):
         """
-        Remove the HTTPS handler.
+        Invoke the setup function and then send the request.
         """
-        self.remove_handler("HTTPS")
+        self.setup_function()
+        self.setup_function = None
+        return self.send_request(req_obj)
 
     def send_request(self, req_obj):
         """
         Send the request and return the response.
         """
-        if self.setup_function:
-            self.setup_function()
-            self.setup_function = None
-        LOGGER.debug(orjson.dumps(req_obj, indent="  ", sort_keys=True))
-        req = orjson.dumps(req_obj).encode("UTF-8")
+        LOGGER.debug("%s", LazyJson(req_obj))
+        return self.send_body(orjson.dumps(req_obj))
+
+    def send_body(self, body):
+        """
+        Send an already serialized request and return the response.
+        """
         try:
-            with self.opener.open(self.uri, req) as handle:
-                obj = orjson.loads(handle.read().decode())
-                try:
-                    return obj["result"]
-                except KeyError:
-                    raise Aria2JsonRpcError("unexpected result: {}".format(obj))
-        except (urllib.error.URLError, ConnectionResetError) as err:
-            # This should work but URLError does not set the errno attribute:
-            # e.errno == errno.ECONNREFUSED
-            err_str = str(err)
-            raise Aria2JsonRpcError(
-                err_str,
-                connection_error=(
-                    "111" in err_str or isinstance(err, ConnectionResetError)
-                ),
-            )
+            obj = orjson.loads(self.post(body))
+            # Batch responses are matched to the requests by position.
+            if isinstance(obj, list):
+                return [get_result(o) for o in obj]
+            return get_result(obj)
         except http.client.BadStatusLine as err:
+            if isinstance(err, ConnectionResetError):
+                raise Aria2JsonRpcError(str(err), connection_error=True)
             raise Aria2JsonRpcError(
                 "{}: BadStatusLine: {} (HTTPS error?)".format(
                     self.__class__.__name__, err
                 )
             )
+        except OSError as err:
+            # ECONNREFUSED and ECONNRESET mean that the server is not (yet)
+            # listening.
+            raise Aria2JsonRpcError(
+                str(err),
+                connection_error=isinstance(
+                    err, (ConnectionRefusedError, ConnectionResetError)
+                ),
+            )
 
     def jsonrpc(self, method, params=None, prefix="aria2."):
         """
         POST a request to the RPC interface.
         """
+        return self.dispatch(self.build_request(method, params, prefix))
+
+    def build_request(self, method, params=None, prefix="aria2."):
+        """
+        Build the request object of an RPC method call, with the token.
+        """
         if not params:
             params = []
 
-        if self.token is not None:
-            token_str = "token:{}".format(self.token)
+        token_str = self.token_str
+        if token_str is not None:
             if method == "multicall":
                 for param in params[0]:
-                    try:
-                        param["params"].insert(0, token_str)
-                    except KeyError:
-                        param["params"] = [token_str]
+                    param["params"] = [token_str, *param.get("params", ())]
             else:
-                params.insert(0, token_str)
+                params = [token_str, *params]
+
+        try:
+            method_name = self.METHOD_NAMES[prefix, method]
+        except KeyError:
+            method_name = self.METHOD_NAMES.setdefault(
+                (prefix, method), sys.intern(prefix + method)
+            )
 
-        req_obj = {
+        return {
             "jsonrpc": "2.0",
             "id": self.identity,
-            "method": prefix + method,
+            "method": method_name,
             "params": params,
         }
+
+    def no_param_jsonrpc(self, method):
+        """
+        Same as jsonrpc() for methods without parameters. The request objects
+        are built once and reused.
+        """
+        try:
+            req_obj = self.no_param_requests[method]
+        except KeyError:
+            params = [] if self.token_str is None else [self.token_str]
+            req_obj = self.no_param_requests[method] = {
+                "jsonrpc": "2.0",
+                "id": self.identity,
+                "method": "aria2." + method,
+                "params": params,
+            }
+        if self.mode == "format":
+            # The caller may modify the returned object, so keep the cached one
+            # intact.
+            return dict(req_obj, params=list(req_obj["params"]))
+        return self.dispatch(req_obj)
+
+    def dispatch(self, req_obj):
+        """
+        Send, queue or return a request object depending on the mode.
+        """
         if self.mode == "batch":
             self.queue.append(req_obj)
             return None
@@ -630,13 +874,49 @@ class Aria2JsonRpc(object):
             return req_obj
         return self.send_request(req_obj)
 
+    def send_many(self, req_objs):
+        """
+        Send several request objects as a single JSON-RPC batch and return
+        their results in order.
+        """
+        if not req_objs:
+            return []
+        return self.send_request(list(req_objs))
+
     def process_queue(self):
         """
         Processed queued requests.
         """
         req_obj = self.queue
         self.queue = []
-        return self.send_request(req_obj)
+        return self.send_many(req_obj)
+
+    @contextlib.contextmanager
+    def pipeline(self):
+        """
+        Queue the requests made within the context and send them in a single
+        POST on exit. The yielded list is filled with their results, in order.
+
+            with a2jr.pipeline() as results:
+                a2jr.getVersion()
+                a2jr.getGlobalStat()
+            version, stat = results
+
+        The mode and queue of the instance are replaced within the context, so
+        this is not thread-safe: use send_many() with request objects from
+        build_request() when the instance is shared between threads.
+        """
+        mode = self.mode
+        queue = self.queue
+        self.mode = "batch"
+        self.queue = []
+        results = []
+        try:
+            yield results
+            results.extend(self.process_queue())
+        finally:
+            self.mode = mode
+            self.queue = queue
 
     # ----------------------------- Standard Methods ----------------------------- #
 
@@ -723,7 +1003,7 @@ class Aria2JsonRpc(object):
         """
         aria2.pauseAll method
         """
-        return self.jsonrpc("pauseAll")
+        return self.no_param_jsonrpc("pauseAll")
 
     def forcePause(self, gid):
         """
@@ -738,7 +1018,7 @@ class Aria2JsonRpc(object):
         """
         aria2.forcePauseAll method
         """
-        return self.jsonrpc("forcePauseAll")
+        return self.no_param_jsonrpc("forcePauseAll")
 
     def unpause(self, gid):
         """
@@ -753,7 +1033,7 @@ class Aria2JsonRpc(object):
         """
         aria2.unpauseAll method
         """
-        return self.jsonrpc("unpauseAll")
+        return self.no_param_jsonrpc("unpauseAll")
 
     def tellStatus(self, gid, keys=None):
         """
@@ -927,7 +1207,7 @@ class Aria2JsonRpc(object):
 
         Returns a dictionary.
         """
-        return self.jsonrpc("getGlobalOption")
+        return self.no_param_jsonrpc("getGlobalOption")
 
     def changeGlobalOption(self, options):
         """
@@ -944,13 +1224,13 @@ class Aria2JsonRpc(object):
 
         Returns a dictionary.
         """
-        return self.jsonrpc("getGlobalStat")
+        return self.no_param_jsonrpc("getGlobalStat")
 
     def purgeDownloadResult(self):
         """
         aria2.purgeDownloadResult method
         """
-        self.jsonrpc("purgeDownloadResult")
+        self.no_param_jsonrpc("purgeDownloadResult")
 
     def removeDownloadResult(self, gid):
         """
@@ -967,7 +1247,7 @@ class Aria2JsonRpc(object):
 
         Returns a dictionary.
         """
-        return self.jsonrpc("getVersion")
+        return self.no_param_jsonrpc("getVersion")
 
     def getSessionInfo(self):
         """
@@ -975,19 +1255,19 @@ class Aria2JsonRpc(object):
 
         Returns a dictionary.
         """
-        return self.jsonrpc("getSessionInfo")
+        return self.no_param_jsonrpc("getSessionInfo")
 
     def shutdown(self):
         """
         aria2.shutdown method
         """
-        return self.jsonrpc("shutdown")
+        return self.no_param_jsonrpc("shutdown")
 
     def forceShutdown(self):
         """
         aria2.forceShutdown method
         """
-        return self.jsonrpc("forceShutdown")
+        return self.no_param_jsonrpc("forceShutdown")
 
     def multicall(self, methods):
         """
@@ -1005,8 +1285,8 @@ class Aria2JsonRpc(object):
         """
         Read a file into a base64-encoded string.
         """
-        with open(path, "rb") as handle:
-            return base64.b64encode(handle.read()).encode(JSON_ENCODING)
+        stat = os.stat(path)
+        return b64encode_file_cached(path, stat.st_mtime_ns, stat.st_size)
 
     def add_torrent(self, path, uris=None, options=None, position=None):
         """
@@ -1035,34 +1315,60 @@ class Aria2JsonRpc(object):
         """
         if not interval or interval < 0:
             interval = 1
-        while True:
+        for delay in backoff_delays(interval):
             status = self.get_status(gid)
-            if status in TEMPORARY_STATUS:
-                time.sleep(interval)
-            else:
+            if status not in TEMPORARY_STATUS:
                 return status
+            time.sleep(delay)
+
+    def status_multicall(self, gids):
+        """
+        Query the status of the GIDs with one multicall. Successive polls
+        usually ask for the same GIDs, so the serialized request is cached and
+        sent again as-is.
+        """
+        if self.mode != "normal" or self.setup_function:
+            return self.multicall(status_methods(gids))
+        key = tuple(gids)
+        body = self.status_bodies.get(key)
+        if body is None:
+            # Build the request object directly instead of switching to format
+            # mode, which would affect other threads using this instance.
+            methods = status_methods(gids)
+            if self.token_str is not None:
+                for method in methods:
+                    method["params"].insert(0, self.token_str)
+            req_obj = {
+                "jsonrpc": "2.0",
+                "id": self.identity,
+                "method": "system.multicall",
+                "params": [methods],
+            }
+            body = orjson.dumps(req_obj)
+            if len(self.status_bodies) >= STATUS_BODIES_MAX_LEN:
+                self.status_bodies.clear()
+            self.status_bodies[key] = body
+        return self.send_body(body)
 
     def get_statuses(self, gids):
         """
         Get the status of multiple GIDs. The status of each is yielded in order.
         """
-        methods = [
-            {"methodName": "aria2.tellStatus", "params": [gid, ["gid", "status"]]}
-            for gid in gids
-        ]
-        results = self.multicall(methods)
-        if results:
-            status = dict((r[0]["gid"], r[0]["status"]) for r in results)
-            for gid in gids:
-                try:
-                    yield status[gid]
-                except KeyError:
-                    LOGGER.error("Aria2 RPC server returned no status for GID %s", gid)
-                    yield "error"
-        else:
-            LOGGER.error("no response from Aria2 RPC server")
-            for gid in gids:
-                yield "error"
+        gids = list(gids)
+        status = dict()
+        for i in range(0, len(gids), MULTICALL_CHUNK_SIZE):
+            results = self.status_multicall(gids[i : i + MULTICALL_CHUNK_SIZE])
+            if not results:
+                LOGGER.error("no response from Aria2 RPC server")
+                yield from ("error" for _ in gids)
+                return
+            status.update((r[0]["gid"], r[0]["status"]) for r in results)
+        for gid in gids:
+            value = status.get(gid)
+            if value is None:
+                LOGGER.error("Aria2 RPC server returned no status for GID %s", gid)
+                value = "error"
+            yield value
 
     def wait_for_final_statuses(self, gids, interval=1):
         """
@@ -1074,16 +1380,21 @@ class Aria2JsonRpc(object):
         """
         if not interval or interval < 0:
             interval = 1
-        statusmap = dict((gid, None) for gid in gids)
-        remaining = list(gid for gid, s in statusmap.items() if s is None)
-        while remaining:
-            for gid, status in zip(remaining, self.get_statuses(remaining)):
+        gids = list(gids)
+        statusmap = dict()
+        # Only the GIDs that are still running are polled.
+        pending = list(dict.fromkeys(gids))
+        delays = backoff_delays(interval)
+        while pending:
+            remaining = []
+            for gid, status in zip(pending, self.get_statuses(pending)):
                 if status in TEMPORARY_STATUS:
-                    continue
-                statusmap[gid] = status
-            remaining = list(gid for gid, status in statusmap.items() if status is None)
-            if remaining:
-                time.sleep(interval)
+                    remaining.append(gid)
+                else:
+                    statusmap[gid] = status
+            pending = remaining
+            if pending:
+                time.sleep(next(delays))
         for gid in gids:
             yield statusmap[gid]
 
@@ -1096,11 +1407,16 @@ class Aria2JsonRpc(object):
             numWaiting = int(status["numWaiting"])
             numStopped = int(status["numStopped"])
             keys = ["totalLength", "completedLength"]
-            total = self.tellActive(keys)
-            waiting = self.tellWaiting(0, numWaiting, keys)
+            # The download lists are independent, so fetch them in one batch.
+            total, waiting, stopped = self.send_many(
+                (
+                    self.build_request("tellActive", [keys]),
+                    self.build_request("tellWaiting", [0, numWaiting, keys]),
+                    self.build_request("tellStopped", [0, numStopped, keys]),
+                )
+            )
             if waiting:
                 total += waiting
-            stopped = self.tellStopped(0, numStopped, keys)
             if stopped:
                 total += stopped
 
@@ -1182,7 +1498,24 @@ class Aria2JsonRpc(object):
             {"methodName": "aria2.{}".format(d[0]), "params": list(d[1:])}
             for d in downloads
         )
-        return self.multicall(methods)
+        if self.mode != "normal":
+            return self.multicall(methods)
+        # Split the multicall so that large torrent and metalink payloads do not
+        # produce oversized request bodies.
+        results = []
+        chunk = []
+        chunk_size = 0
+        for method in methods:
+            size = len(orjson.dumps(method))
+            if chunk and chunk_size + size > MULTICALL_MAX_BYTES:
+                results.extend(self.multicall(chunk))
+                chunk = []
+                chunk_size = 0
+            chunk.append(method)
+            chunk_size += size
+        if chunk:
+            results.extend(self.multicall(chunk))
+        return results
 
     def polymethod_wait_many(self, gid_lists, interval=1):
         """
@@ -13,8 +13,7 @@ def url_to_path(url: str):
         file_path = os.path.join(cache_path, filename)
 
         # 如果缓存路径不存在则创建
-        if not os.path.exists(cache_path):
-            os.makedirs(cache_path)
+        os.makedirs(cache_path, exist_ok=True)
 
         return file_path
     return None
@@ -1,6 +1,3 @@
-import six
-
-
 class BTFailure(Exception):
     pass
 
@@ -9,10 +6,10 @@ def decode_int(x, f):
     f += 1
     newf = x.find(b"e", f)
     n = int(x[f:newf])
-    if six.indexbytes(x, f) == 45:
-        if six.indexbytes(x, f + 1) == 48:
+    if x[f] == 45:
+        if x[f + 1] == 48:
             raise ValueError
-    elif six.indexbytes(x, f) == 48 and newf != f + 1:
+    elif x[f] == 48 and newf != f + 1:
         raise ValueError
     return n, newf + 1
 
@@ -20,7 +17,7 @@ def decode_int(x, f):
 def decode_string(x, f):
     colon = x.find(b":", f)
     n = int(x[f:colon])
-    if six.indexbytes(x, f) == 48 and colon != f + 1:
+    if x[f] == 48 and colon != f + 1:
         raise ValueError
     colon += 1
     return x[colon : colon + n], colon + n
@@ -28,30 +25,34 @@ def decode_string(x, f):
 
 def decode_list(x, f):
     r, f = [], f + 1
-    while six.indexbytes(x, f) != 101:
-        v, f = decode_func[six.indexbytes(x, f)](x, f)
+    while x[f] != 101:
+        v, f = decode_func[x[f]](x, f)
         r.append(v)
     return r, f + 1
 
 
 def decode_dict(x, f):
     r, f = {}, f + 1
-    while six.indexbytes(x, f) != 101:
+    while x[f] != 101:
         k, f = decode_string(x, f)
-        r[k], f = decode_func[six.indexbytes(x, f)](x, f)
+        r[k], f = decode_func[x[f]](x, f)
     return r, f + 1
 
 
-decode_func = {108: decode_list, 100: decode_dict, 105: decode_int}
+# 按首字节索引的跳转表，未知的字节对应None
+decode_func = [None] * 256
+decode_func[108] = decode_list
+decode_func[100] = decode_dict
+decode_func[105] = decode_int
 
-for i in range(48, 59):
+for i in range(48, 58):
     decode_func[i] = decode_string
 
 
 def bdecode(x):
     try:
-        r, l = decode_func[six.indexbytes(x, 0)](x, 0)
-    except (IndexError, KeyError, ValueError):
+        r, l = decode_func[x[0]](x, 0)
+    except (IndexError, TypeError, ValueError):
         raise BTFailure("not a valid bencoded string")
     if l != len(x):
         raise BTFailure("invalid bencoded value (data after valid prefix)")
@@ -66,11 +67,11 @@ class Bencached(object):
 
 
 def encode_bencached(x, r):
-    r.append(x.bencoded)
+    r += x.bencoded
 
 
 def encode_int(x, r):
-    r.extend((b"i", str(x).encode(), b"e"))
+    r += b"i%de" % x
 
 
 def encode_bool(x, r):
@@ -80,23 +81,50 @@ def encode_bool(x, r):
         encode_int(0, r)
 
 
+# 常见长度的前缀（含冒号）预先生成
+LEN_PREFIX = tuple(b"%d:" % i for i in range(4096))
+
+
+def encode_length(n):
+    return LEN_PREFIX[n] if n < 4096 else b"%d:" % n
+
+
 def encode_string(x, r):
-    r.extend((str(len(x)).encode(), b":", x))
+    r += encode_length(len(x))
+    r += x
 
 
 def encode_list(x, r):
-    r.append(b"l")
+    r += b"l"
     for i in x:
-        encode_func[type(i)](i, r)
-    r.append(b"e")
+        encode(i, r)
+    r += b"e"
+
+
+# KRPC消息的键集合只有少数几种，缓存其排序结果：原始键顺序 -> 排序后的键
+SORTED_KEYS = {}
+SORTED_KEYS_MAX_LEN = 1024
+
+
+def sorted_keys(x):
+    keys = tuple(x)
+    try:
+        return SORTED_KEYS[keys]
+    except KeyError:
+        result = tuple(sorted(keys))
+        if len(SORTED_KEYS) < SORTED_KEYS_MAX_LEN:
+            SORTED_KEYS[keys] = result
+        return result
 
 
 def encode_dict(x, r):
-    r.append(b"d")
-    for k, v in sorted(x.items()):
-        r.extend((str(len(k)).encode(), b":", k))
-        encode_func[type(v)](v, r)
-    r.append(b"e")
+    r += b"d"
+    for k in sorted_keys(x):
+        v = x[k]
+        r += encode_length(len(k))
+        r += k
+        encode(v, r)
+    r += b"e"
 
 
 encode_func = {
@@ -109,6 +137,25 @@ encode_func = {
     dict: encode_dict,
 }
 
+
+def encode(x, r):
+    # KRPC消息中几乎只有bytes/int/dict/list，先按类型直接分派，其余查表
+    t = type(x)
+    if t is bytes:
+        r += encode_length(len(x))
+        r += x
+    elif t is int:
+        r += b"i%de" % x
+    elif t is dict:
+        encode_dict(x, r)
+    elif t is list or t is tuple:
+        encode_list(x, r)
+    elif t is str:
+        encode_string(x.encode(), r)
+    else:
+        encode_func[t](x, r)
+
+
 try:
     from types import BooleanType
 
@@ -117,7 +164,16 @@ except ImportError:
     pass
 
 
+def bencode_into(x, out):
+    """
+    将x编码后追加到bytearray out中，返回写入的字节数，便于复用发送缓冲区
+    """
+    start = len(out)
+    encode(x, out)
+    return len(out) - start
+
+
 def bencode(x):
-    r = []
-    encode_func[type(x)](x, r)
-    return b"".join(r)
+    r = bytearray()
+    encode(x, r)
+    return bytes(r)
@@ -1,7 +1,11 @@
 import heapq
 import struct
-from ipaddress import IPv4Address
 from operator import itemgetter
+from socket import inet_aton
+
+# Compact node info: 20-byte id + 4-byte IPv4 address + 2-byte port
+NODE_INFO = struct.Struct("!20s4sH")
+IP_PORT = struct.Struct("!4sH")
 
 
 class Node:
@@ -22,9 +26,28 @@ class Node:
             port (int): Optional port for this Node (set when IP is set)
         """
         self.id = node_id
-        self.ip = ip
-        self.port = port
-        self.long_id = int(node_id.hex(), 16)
+        self._ip = ip
+        self._port = port
+        self._packed = None
+        self.long_id = int.from_bytes(node_id, "big")
+
+    @property
+    def ip(self):
+        return self._ip
+
+    @ip.setter
+    def ip(self, ip):
+        self._ip = ip
+        self._packed = None
+
+    @property
+    def port(self):
+        return self._port
+
+    @port.setter
+    def port(self, port):
+        self._port = port
+        self._packed = None
 
     def same_home_as(self, node):
         return self.ip == node.ip and self.port == node.port
@@ -49,11 +72,17 @@ class Node:
 
     @property
     def packed_ip_port(self):
-        return IPv4Address(self.ip).packed + struct.pack("!H", self.port)
+        return IP_PORT.pack(inet_aton(str(self.ip)), self.port)
 
     @property
     def packed(self):
-        return self.id + self.packed_ip_port
+        """
+        Compact node info (id + ip + port), computed once and reused until the
+        ip or port changes.
+        """
+        if self._packed is None:
+            self._packed = NODE_INFO.pack(self.id, inet_aton(str(self.ip)), self.port)
+        return self._packed
 
 
 class NodeHeap:
@@ -137,3 +166,10 @@ class NodeHeap:
 
     def get_uncontacted(self):
         return [n for n in self if n.id not in self.contacted]
+
+
+def pack_nodes(nodes):
+    """
+    Concatenate the compact node info of nodes, e.g. for a find_node response.
+    """
+    return b"".join([node.packed for node in nodes])
@@ -1,19 +1,17 @@
 import asyncio
-import hashlib
 import os
 import random
 import struct
 from asyncio import DatagramProtocol
 from base64 import b64encode
-from ipaddress import IPv4Address
-
-from expiringdict import ExpiringDict
+from collections import OrderedDict
+from socket import inet_aton
 
 from notetool.tool.log import log
-from .bencode import BTFailure, bdecode, bencode
-from .node import Node
+from .bencode import BTFailure, bdecode, bencode_into, encode_length
+from .node import Node, pack_nodes
 from .routing import RoutingTable
-from .utils import digest
+from .utils import TTLDict, digest
 
 """
 Some code taken from
@@ -35,14 +33,47 @@ DHT网络的其中一种协议实现(Kademlia)
 MIN_ID = 0
 MAX_ID = 2**160
 
+# Compact peer info: 4-byte IPv4 address + 2-byte port, network byte order
+COMPACT_PEER = struct.Struct("!4sH")
+
+# Decoded argument names of incoming queries; the set of names in use is small
+ARG_KEYS = {}
+ARG_KEYS_MAX_LEN = 256
+
+
+def decode_key(key):
+    try:
+        return ARG_KEYS[key]
+    except KeyError:
+        value = key.decode("utf-8")
+        if len(ARG_KEYS) < ARG_KEYS_MAX_LEN:
+            ARG_KEYS[key] = value
+        return value
+
+
+def encode_response(transaction_id, response, out):
+    """
+    bencode {b"r": response, b"t": transaction_id, b"y": b"r"} into the
+    bytearray out, replacing its contents; the envelope keys are fixed, so only
+    the response itself goes through bencode.
+    """
+    del out[:]
+    out += b"d1:r"
+    bencode_into(response, out)
+    out += b"1:t"
+    out += encode_length(len(transaction_id))
+    out += transaction_id
+    out += b"1:y1:re"
+    return out
+
 
 class ForgetfulPeerStorage:
     logger = log(__name__)
 
     def __init__(self, ttl=3600):
         self._ttl = ttl
-        self._data = ExpiringDict(max_age_seconds=ttl, max_len=2000)
-        self.data = ExpiringDict(max_age_seconds=ttl, max_len=2000)
+        self._data = TTLDict(ttl, max_len=2000)
+        self.data = TTLDict(ttl, max_len=2000)
 
     def get_peers(self, info_hash):
         if info_hash not in self._data:
@@ -56,10 +87,10 @@ class ForgetfulPeerStorage:
 
 class ForgetfulTokenStorage:
     def __init__(self, ttl=600):
-        self._data = ExpiringDict(max_age_seconds=ttl, max_len=2000)
+        self._data = TTLDict(ttl, max_len=2000)
 
     def get_token(self, sender, id, info_hash):
-        token = bytes([random.randint(0, 255) for _ in range(16)])
+        token = os.urandom(16)
         self._data[token] = (sender[0], id, info_hash)
         return token
 
@@ -87,7 +118,12 @@ class KRPCProtocol(DatagramProtocol):
         self.token_storage = token_storage or ForgetfulTokenStorage()
         self.source_node = source_node or Node(digest(random.getrandbits(255)))
         self._wait_timeout = wait_timeout
-        self._outstanding = {}
+        # transaction_id -> (future, deadline), in deadline order
+        self._outstanding = OrderedDict()
+        self._sweeper = None
+        # Reusable encoding buffer for outgoing datagrams; the transport copies
+        # the data if it cannot send it right away.
+        self._tx_buf = bytearray()
         self.transport = None
 
     def connection_made(self, transport):
@@ -154,10 +190,10 @@ class KRPCProtocol(DatagramProtocol):
             )
             return
 
-        if not asyncio.iscoroutinefunction(func):
-            func = asyncio.coroutine(func)
-        args = {k.decode("utf-8"): v for (k, v) in args.items()}
-        response = await func(addr, **args)
+        args = {decode_key(k): v for (k, v) in args.items()}
+        response = func(addr, **args)
+        if asyncio.iscoroutine(response):
+            response = await response
         if response is not None:
             self.logger.debug(
                 "sending response %s for msg id %s to %s",
@@ -165,12 +201,7 @@ class KRPCProtocol(DatagramProtocol):
                 b64encode(transaction_id),
                 addr,
             )
-            tx_data = bencode(
-                {
-                    b"y": b"r",
-                    b"r": response,
-                }
-            )
+            tx_data = encode_response(transaction_id, response, self._tx_buf)
             self.transport.sendto(tx_data, addr)
 
     async def handle_response(self, transaction_id, args, addr):
@@ -193,11 +224,9 @@ class KRPCProtocol(DatagramProtocol):
         self.logger.debug(
             "received response %s for message " "id %s from %s", args, *msg_args
         )
-        future, timeout = self._outstanding[transaction_id]
-        timeout.cancel()
+        future, _ = self._outstanding.pop(transaction_id)
         if not future.cancelled():
             future.set_result((True, args))
-        del self._outstanding[transaction_id]
 
     def handle_error(self, transaction_id, args, addr):
         """
@@ -217,10 +246,26 @@ class KRPCProtocol(DatagramProtocol):
         self.logger.info(
             "Did not received reply for msg " "id %s within %i seconds", *args
         )
-        future = self._outstanding[transaction_id][0]
+        future, _ = self._outstanding.pop(transaction_id)
         if not future.cancelled():
             future.set_result((False, None))
-        del self._outstanding[transaction_id]
+
+    def _sweep_timeouts(self):
+        """
+        Expire every outstanding request whose deadline has passed, then
+        schedule the next sweep for the oldest remaining one. All requests share
+        the same wait timeout, so the map is ordered by deadline and a single
+        timer replaces one call_later per request.
+        """
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        self._sweeper = None
+        while self._outstanding:
+            transaction_id, (_, deadline) = next(iter(self._outstanding.items()))
+            if deadline > now:
+                self._sweeper = loop.call_at(deadline, self._sweep_timeouts)
+                break
+            self._timeout(transaction_id)
 
     def get_refresh_ids(self):
         """
@@ -273,8 +318,8 @@ class KRPCProtocol(DatagramProtocol):
         return {b"id": id}
 
     def rpc_find_node(self, sender, id, target, want="n4", token=None):
-        self.logger.info("finding neighbors of %i in local table", int(id.hex(), 16))
         source = Node(id, sender[0], sender[1])
+        self.logger.info("finding neighbors of %i in local table", source.long_id)
         if not self.is_valid_node_id(source):
             return
 
@@ -283,7 +328,7 @@ class KRPCProtocol(DatagramProtocol):
         if not self.is_valid_node_id(node):
             return
         neighbors = self.router.find_neighbors(node, exclude=source)
-        data = {b"id": id, b"nodes": b"".join([n.packed for n in neighbors])}
+        data = {b"id": id, b"nodes": pack_nodes(neighbors)}
         if token:
             data[b"token"] = token
         return data
@@ -304,7 +349,7 @@ class KRPCProtocol(DatagramProtocol):
             b"id": id,
             b"token": token,
             b"values": [
-                IPv4Address(peer[0]).packed + struct.pack("!H", peer[1])
+                COMPACT_PEER.pack(inet_aton(peer[0]), peer[1])
                 for peer in peers
             ],
         }
@@ -441,7 +486,7 @@ class KRPCProtocol(DatagramProtocol):
 
     @staticmethod
     def generate_token():
-        return bytes([random.randint(0, 255) for _ in range(16)])
+        return os.urandom(16)
 
     def __getattr__(self, name):
         """
@@ -463,14 +508,17 @@ class KRPCProtocol(DatagramProtocol):
             pass
 
         def func(address, args):
-            transaction_id = hashlib.sha1(os.urandom(32)).digest()
-            txdata = bencode(
+            transaction_id = os.urandom(20)
+            txdata = self._tx_buf
+            del txdata[:]
+            bencode_into(
                 {
                     b"y": b"q",
                     b"t": transaction_id,
                     b"a": args,
                     b"q": name.encode("utf-8"),
-                }
+                },
+                txdata,
             )
             self.logger.debug(
                 "calling remote function %s on %s (msgid %s)",
@@ -485,8 +533,10 @@ class KRPCProtocol(DatagramProtocol):
                 future = loop.create_future()
             else:
                 future = asyncio.Future()
-            timeout = loop.call_later(self._wait_timeout, self._timeout, transaction_id)
-            self._outstanding[transaction_id] = (future, timeout)
+            deadline = loop.time() + self._wait_timeout
+            self._outstanding[transaction_id] = (future, deadline)
+            if self._sweeper is None:
+                self._sweeper = loop.call_at(deadline, self._sweep_timeouts)
             return future
 
         return func
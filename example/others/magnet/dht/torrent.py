@@ -4,7 +4,15 @@ from pathlib import Path
 from urllib.parse import parse_qs, urlparse, quote
 
 from notetool.tool.log import log
-from .bencode import bdecode, bencode
+
+# 优先使用C实现的bencode库解析种子文件，未安装时回退到本地的纯Python实现
+try:
+    from better_bencode import dumps as bencode, loads as bdecode
+except ImportError:
+    try:
+        from fastbencode import bdecode, bencode
+    except ImportError:
+        from .bencode import bdecode, bencode
 
 logger = log(__name__)
 
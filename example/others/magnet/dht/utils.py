@@ -1,6 +1,8 @@
 import asyncio
 import hashlib
 import operator
+import time
+from collections import OrderedDict
 
 """
 General catchall for functions that don't make sense as methods.
@@ -44,3 +46,62 @@ def shared_prefix(args):
 def bytes_to_bit_string(bites):
     bits = [bin(bite)[2:].rjust(8, "0") for bite in bites]
     return "".join(bits)
+
+
+class TTLDict:
+    """
+    A dict whose entries expire ttl seconds after they were last set.
+
+    Entries are kept in an OrderedDict in the order they were last set, which
+    is also the order in which they expire, so expired entries are dropped
+    lazily from the front and each operation does amortized O(1) work. When
+    max_len is exceeded the oldest entries are dropped first.
+    """
+
+    def __init__(self, ttl, max_len=None):
+        self._ttl = ttl
+        self._max_len = max_len
+        self._data = OrderedDict()
+
+    def _evict(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        data = self._data
+        while data and (
+            next(iter(data.values()))[0] <= now
+            or (self._max_len is not None and len(data) > self._max_len)
+        ):
+            data.popitem(last=False)
+
+    def __setitem__(self, key, value):
+        now = time.monotonic()
+        self._data[key] = (now + self._ttl, value)
+        # Setting a key again renews it, so move it behind the others.
+        self._data.move_to_end(key)
+        self._evict(now)
+
+    def __getitem__(self, key):
+        self._evict()
+        return self._data[key][1]
+
+    def __delitem__(self, key):
+        self._evict()
+        del self._data[key]
+
+    def __contains__(self, key):
+        self._evict()
+        return key in self._data
+
+    def __len__(self):
+        self._evict()
+        return len(self._data)
+
+    def get(self, key, default=None):
+        self._evict()
+        item = self._data.get(key)
+        return default if item is None else item[1]
+
+    def pop(self, key, default=None):
+        self._evict()
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
@@ -109,6 +109,22 @@ def get_filepath(
         return os.path.join(filedir, filename)
 
 
+def get_local_size(filepath: str) -> Optional[int]:
+    """
+    获取本地文件大小，只触发一次stat调用
+
+    Args:
+        filepath: 本地文件路径
+
+    Returns:
+        Optional[int]: 文件大小(字节)，文件不存在时返回None
+    """
+    try:
+        return os.stat(filepath).st_size
+    except FileNotFoundError:
+        return None
+
+
 class BaseDrive:
     def __init__(self, *args, **kwargs):
         """
@@ -256,8 +272,7 @@ class BaseDrive:
         """
         if not self.exist(fid):
             return False
-        if not os.path.exists(filedir):
-            os.makedirs(filedir, exist_ok=True)
+        os.makedirs(filedir, exist_ok=True)
         for file in self.get_file_list(fid):
             if ignore_filter and ignore_filter(file.name):
                 continue
@@ -324,22 +339,22 @@ class BaseDrive:
         :param kwargs: 关键字参数
         :return: 上传是否成功
         """
-        dir_map = dict([(file.name, file.fid) for file in self.get_dir_list(fid=fid)])
-        for file in os.listdir(filedir):
-            filepath = os.path.join(filedir, file)
-            if os.path.isfile(filepath):
-                self.upload_file(filepath, fid)
-            elif os.path.isdir(filepath):
-                if file not in dir_map:
-                    dir_map[file] = self.mkdir(fid, file)
-                self.upload_dir(
-                    filepath,
-                    dir_map[file],
-                    recursion=recursion,
-                    overwrite=overwrite,
-                    *args,
-                    **kwargs,
-                )
+        dir_map = {file.name: file.fid for file in self.get_dir_list(fid=fid)}
+        with os.scandir(filedir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    self.upload_file(entry.path, fid)
+                elif entry.is_dir():
+                    if entry.name not in dir_map:
+                        dir_map[entry.name] = self.mkdir(fid, entry.name)
+                    self.upload_dir(
+                        entry.path,
+                        dir_map[entry.name],
+                        recursion=recursion,
+                        overwrite=overwrite,
+                        *args,
+                        **kwargs,
+                    )
         return True
 
     def share(
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import os
+import time
 from aligo import Aligo
 from funsecret import read_secret
 from funutil import getLogger
@@ -12,15 +13,19 @@ logger = getLogger("fundrive")
 
 
 class AlipanDrive(BaseDrive):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, list_cache_ttl: float = 30, **kwargs):
         """
         初始化阿里云盘驱动
         :param args: 位置参数
+        :param list_cache_ttl: 目录列表缓存有效期（秒），0表示不缓存
         :param kwargs: 关键字参数
         """
         super(AlipanDrive, self).__init__(*args, **kwargs)
 
         self.drive: Aligo = None
+        # 目录列表缓存: fid -> (缓存时间, 条目列表)，文件和子目录共用一次请求
+        self._list_cache: Dict[str, Tuple[float, list]] = {}
+        self._list_cache_ttl = list_cache_ttl
 
     def login(
         self,
@@ -57,10 +62,11 @@ class AlipanDrive(BaseDrive):
         :param return_if_exist: 如果文件夹已存在，是否返回已存在的文件夹ID
         :return: 创建的文件夹ID
         """
-        dir_map = dict([(file.name, file.fid) for file in self.get_dir_list(fid=fid)])
+        dir_map = {file.name: file.fid for file in self.get_dir_list(fid=fid)}
         if name in dir_map:
             logger.info(f"name={name} exists, return fid={fid}")
             return dir_map[name]
+        self._list_cache.pop(fid, None)
         return self.drive.create_folder(parent_file_id=fid, name=name).file_id
 
     def delete(self, fid: str, *args, **kwargs) -> bool:
@@ -70,6 +76,7 @@ class AlipanDrive(BaseDrive):
         :return: 删除是否成功
         """
         self.drive.move_file_to_trash(file_id=fid)
+        self._list_cache.clear()
         return True
 
     def exist(self, fid: str, *args, **kwargs) -> bool:
@@ -80,6 +87,30 @@ class AlipanDrive(BaseDrive):
         """
         return self.drive.get_file(file_id=fid) is not None
 
+    def _list_raw(self, fid: str) -> list:
+        """
+        获取目录下的全部条目，短时间内的重复调用复用同一次请求结果
+        :param fid: 目录ID
+        :return: 文件和子目录条目列表
+        """
+        if self._list_cache_ttl <= 0:
+            return list(self.drive.get_file_list(parent_file_id=fid))
+        now = time.monotonic()
+        cached = self._list_cache.get(fid)
+        if cached is not None and now - cached[0] < self._list_cache_ttl:
+            return cached[1]
+        items = list(self.drive.get_file_list(parent_file_id=fid))
+        # 写入前清理过期条目，避免缓存随遍历过的目录无限增长
+        expired = [
+            key
+            for key, (ts, _) in list(self._list_cache.items())
+            if now - ts >= self._list_cache_ttl
+        ]
+        for key in expired:
+            self._list_cache.pop(key, None)
+        self._list_cache[fid] = (now, items)
+        return items
+
     def get_file_list(self, fid: str = "root", *args, **kwargs) -> List[DriveFile]:
         """
         获取指定目录下的文件列表
@@ -87,7 +118,7 @@ class AlipanDrive(BaseDrive):
         :return: 文件信息列表
         """
         result = []
-        for file in self.drive.get_file_list(parent_file_id=fid):
+        for file in self._list_raw(fid):
             if file.type == "file":
                 result.append(
                     DriveFile(
@@ -106,7 +137,7 @@ class AlipanDrive(BaseDrive):
         :return: 子目录信息列表
         """
         result = []
-        for file in self.drive.get_file_list(parent_file_id=fid):
+        for file in self._list_raw(fid):
             if file.type == "folder":
                 result.append(
                     DriveFile(fid=file.file_id, name=file.name, size=file.size)
@@ -168,6 +199,7 @@ class AlipanDrive(BaseDrive):
             parent_file_id=fid,
             check_name_mode="overwrite" if overwrite else "refuse",
         )
+        self._list_cache.pop(fid, None)
         return True
 
     def share(
@@ -199,3 +231,4 @@ class AlipanDrive(BaseDrive):
         r = self.drive.share_link_extract_code(shared_url)
         r.share_pwd = password or r.share_pwd
         self.drive.share_file_save_all_to_drive(share_token=r, to_parent_file_id=fid)
+        self._list_cache.pop(fid, None)
@@ -65,7 +65,7 @@ class AliopenDrive(BaseDrive):
         :param return_if_exist: 如果文件夹已存在，是否返回已存在的文件夹ID
         :return: 创建的文件夹ID
         """
-        dir_map = dict([(file.name, file.fid) for file in self.get_dir_list(fid=fid)])
+        dir_map = {file.name: file.fid for file in self.get_dir_list(fid=fid)}
         if name in dir_map:
             logger.info(f"name={name} exists, return fid={fid}")
             return dir_map[name]
@@ -71,7 +71,7 @@ class BaiDuDrive(BaseDrive):
         :param kwargs: 关键字参数
         :return: 创建的目录ID
         """
-        dir_map = dict([(file.name, file.fid) for file in self.get_dir_list(fid=fid)])
+        dir_map = {file.name: file.fid for file in self.get_dir_list(fid=fid)}
         if name in dir_map:
             logger.info(f"name={name} exists, return fid={fid}")
             return dir_map[name]
@@ -232,8 +232,7 @@ class BaiDuDrive(BaseDrive):
         """
         if not self.exist(fid):
             return False
-        if not os.path.exists(filedir):
-            os.makedirs(filedir, exist_ok=True)
+        os.makedirs(filedir, exist_ok=True)
         for file in self.get_file_list(fid):
             if ignore_filter and ignore_filter(file.name):
                 continue
@@ -3,6 +3,10 @@
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from typing import List
 
 from fundrives.lanzou import LanZouCloud
@@ -39,11 +43,17 @@ class Task:
 class ProgressWrap:
     """
     下载进度条包装类
+    回调按字节数和时间间隔节流，避免每个数据块都刷新进度条
     """
 
-    def __init__(self, callback: tqdm = None):
+    __slots__ = ("callback", "last_size", "last_ts", "min_bytes", "min_interval")
+
+    def __init__(self, callback: tqdm = None, min_bytes=256 * 1024, min_interval=0.25):
         self.callback = callback
         self.last_size = 0
+        self.last_ts = 0.0
+        self.min_bytes = min_bytes
+        self.min_interval = min_interval
 
     def init(self, file_name, total_size):
         if self.callback is None:
@@ -53,11 +63,48 @@ class ProgressWrap:
                 unit_divisor=1024,
                 desc=file_name,
                 total=total_size,
+                mininterval=self.min_interval,
+                miniters=self.min_bytes,
             )
 
     def update(self, now_size):
-        self.callback.update(now_size - self.last_size)
+        delta = now_size - self.last_size
+        now = time.monotonic()
+        if (
+            delta < self.min_bytes
+            and now - self.last_ts < self.min_interval
+            and now_size != self.callback.total
+        ):
+            return
+        self.callback.update(delta)
         self.last_size = now_size
+        self.last_ts = now
+
+    @contextmanager
+    def watch(self, task: Task):
+        """
+        后台线程按min_interval读取task.now_size刷新进度条，
+        传输循环中的回调不再直接触碰tqdm
+        """
+        stop_event = threading.Event()
+
+        def pump():
+            while not stop_event.wait(self.min_interval):
+                self.update(task.now_size)
+
+        thread = threading.Thread(target=pump, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop_event.set()
+            thread.join()
+            self.callback.update(task.now_size - self.last_size)
+            self.last_size = task.now_size
+
+
+def _noop(*args, **kwargs):
+    pass
 
 
 class LanZouDrive(BaseDrive):
@@ -70,6 +117,9 @@ class LanZouDrive(BaseDrive):
         super(LanZouDrive, self).__init__(*args, **kwargs)
         self.allow_big_file = False
         self.drive = None
+        # 远端目录列表缓存: fid -> (缓存时间, 子目录列表, 文件列表)
+        self._list_cache = {}
+        self._list_cache_ttl = 30
 
     def ignore_limit(self):
         """忽略大文件限制"""
@@ -108,12 +158,30 @@ class LanZouDrive(BaseDrive):
     def exist(self, path, *args, **kwargs) -> bool:
         return True
 
-    def mkdir(self, fid, name, url=None, pwd=None, *args, **kwargs) -> bool:
-        return self.drive.mkdir(fid, name, *args, **kwargs) == 0
+    def mkdir(self, fid, name, url=None, pwd=None, *args, **kwargs) -> str:
+        self._list_cache.pop(fid, None)
+        folder_id = self.drive.mkdir(fid, name, *args, **kwargs)
+        if folder_id == LanZouCloud.MKDIR_ERROR:
+            logger.error(f"mkdir failed, fid={fid}, name={name}")
+            return None
+        return folder_id
 
     def delete(self, fid=None, *args, **kwargs) -> bool:
+        self._list_cache.clear()
         return self.drive.delete(fid, *args, **kwargs) == 0
 
+    def _get_dir_and_file_list(self, fid):
+        now = time.monotonic()
+        cached = self._list_cache.get(fid)
+        if cached is None or now - cached[0] >= self._list_cache_ttl:
+            # 子目录和文件列表是两个独立请求，并发发出
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                dir_future = executor.submit(self.get_dir_list, fid)
+                file_future = executor.submit(self.get_file_list, fid)
+                cached = (now, dir_future.result(), file_future.result())
+            self._list_cache[fid] = cached
+        return cached[1], cached[2]
+
     def get_dir_list(self, fid, url=None, pwd=None, *args, **kwargs) -> List[DriveFile]:
         result = []
         for item in self.drive.get_dir_list(folder_id=fid)[0]:
@@ -211,15 +279,13 @@ class LanZouDrive(BaseDrive):
         wrap = ProgressWrap()
         wrap.init(file_info["name"], file_info["size"])
 
-        def clb():
-            wrap.update(task.now_size)
-
-        return (
-            self.drive.down_file_by_url(
-                share_url=file_info["url"], task=task, callback=clb
+        with wrap.watch(task):
+            return (
+                self.drive.down_file_by_url(
+                    share_url=file_info["url"], task=task, callback=_noop
+                )
+                == 0
             )
-            == 0
-        )
 
     def download_dir(
         self, fid, filedir, recursion=True, overwrite=False, *args, **kwargs
@@ -272,26 +338,95 @@ class LanZouDrive(BaseDrive):
         pwd=None,
         recursion=True,
         overwrite=False,
+        size=None,
         *args,
         **kwargs,
     ) -> bool:
+        if size is None:
+            size = os.stat(filepath).st_size
         task = Task(url=url, pwd=pwd, path=filepath, folder_id=fid)
         wrap = ProgressWrap()
-        wrap.init(os.path.basename(filepath), os.stat(filepath).st_size)
-
-        def clb():
-            wrap.update(task.now_size)
-
-        return (
-            self.drive.upload_file(
-                task=task,
-                file_path=filepath,
-                folder_id=fid,
-                callback=clb,
-                allow_big_file=self.allow_big_file,
-            )[0]
-            == 0
-        )
+        wrap.init(os.path.basename(filepath), size)
+
+        self._list_cache.pop(fid, None)
+        with wrap.watch(task):
+            return (
+                self.drive.upload_file(
+                    task=task,
+                    file_path=filepath,
+                    folder_id=fid,
+                    callback=_noop,
+                    allow_big_file=self.allow_big_file,
+                )[0]
+                == 0
+            )
+
+    def upload_dir(
+        self,
+        filedir,
+        fid,
+        recursion=True,
+        overwrite=False,
+        max_workers=4,
+        *args,
+        **kwargs,
+    ) -> bool:
+        """
+        上传文件夹，已存在的同名文件默认跳过
+        目录结构在当前线程中依次创建，文件上传提交到线程池并发执行
+
+        Args:
+            filedir: 本地目录路径
+            fid: 目标目录ID
+            recursion: 是否递归上传子目录
+            overwrite: 是否覆盖已存在的文件
+            max_workers: 并发上传的最大线程数
+
+        Returns:
+            bool: 上传是否成功
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_list = self._upload_dir(
+                filedir, fid, recursion, overwrite, executor
+            )
+            results = [future.result() for future in as_completed(future_list)]
+        return all(results)
+
+    def _upload_dir(self, filedir, fid, recursion, overwrite, executor):
+        future_list = []
+        yun_dir_list, yun_file_list = self._get_dir_and_file_list(fid)
+        yun_dir_dict = {yun["name"]: yun["fid"] for yun in yun_dir_list}
+        yun_file_names = frozenset(yun["name"] for yun in yun_file_list)
+        with os.scandir(filedir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not recursion:
+                        continue
+                    if entry.name not in yun_dir_dict:
+                        folder_id = self.mkdir(fid, entry.name)
+                        if folder_id is None:
+                            continue
+                        yun_dir_dict[entry.name] = folder_id
+                    future_list.extend(
+                        self._upload_dir(
+                            entry.path,
+                            yun_dir_dict[entry.name],
+                            recursion,
+                            overwrite,
+                            executor,
+                        )
+                    )
+                elif entry.is_file():
+                    if overwrite or entry.name not in yun_file_names:
+                        future_list.append(
+                            executor.submit(
+                                self.upload_file,
+                                entry.path,
+                                fid,
+                                size=entry.stat().st_size,
+                            )
+                        )
+        return future_list
 
     def move_file(self, file_id, folder_id):
         self.drive.move_file(file_id, folder_id)
@@ -1,11 +1,17 @@
+import heapq
 import os
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 from funfile.compress import tarfile
+from funutil import getLogger
 
 from fundrive.core import DriveSnapshot
 
 from .drive import LanZouDrive
 
+logger = getLogger("fundrive")
+
 
 class LanZouSnapshot(DriveSnapshot):
     def __init__(self, fid=None, url=None, pwd="", *args, **kwargs):
@@ -15,12 +21,23 @@ class LanZouSnapshot(DriveSnapshot):
         self.url = url
         self.pwd = pwd
 
-    def delete_outed_version(self):
-        datas = self.drive.get_file_list(path=self.fid)
-        datas = sorted(datas, key=lambda x: x["name"], reverse=True)
-        if len(datas) > self.version_num:
-            for i in range(self.version_num, len(datas)):
-                self.drive.delete(datas[i]["fid"], is_file=True)
+    def delete_outed_version(self, max_workers=4):
+        datas = self.drive.get_file_list(fid=self.fid)
+        if len(datas) <= self.version_num:
+            return
+        keep = {
+            data["fid"]
+            for data in heapq.nlargest(self.version_num, datas, key=itemgetter("name"))
+        }
+        stale = [data["fid"] for data in datas if data["fid"] not in keep]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_list = [
+                executor.submit(self.drive.delete, fid, is_file=True) for fid in stale
+            ]
+        # 按提交顺序取结果，删除时的异常照常抛出，返回False的记录日志
+        for fid, future in zip(stale, future_list):
+            if not future.result():
+                logger.error(f"delete outed version failed, fid={fid}")
 
     def update(self, file_path, *args, **kwargs):
         gz_path = self._tar_path(file_path)
@@ -36,8 +53,7 @@ class LanZouSnapshot(DriveSnapshot):
         if len(datas) == 0:
             print("没有快照文件")
             return
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path)
+        os.makedirs(dir_path, exist_ok=True)
         datas = sorted(datas, key=lambda x: x["name"], reverse=True)
         self.drive.download_file(
             dir_path=dir_path,
@@ -7,6 +7,7 @@ from funsecret import read_secret
 from funutil import getLogger
 
 from fundrive.core import BaseDrive
+from fundrive.core.base import get_local_size
 
 logger = getLogger("fundrive")
 
@@ -86,11 +87,7 @@ class OpenXLabDrive(BaseDrive):
         try:
             file_info = self.get_file_info(dataset_id=dataset_id, file_path=file_path)
             filepath = os.path.join(dir_path, file_info["path"])
-            if (
-                os.path.exists(filepath)
-                and not overwrite
-                and file_info["size"] == os.path.getsize(filepath)
-            ):
+            if not overwrite and get_local_size(filepath) == file_info["size"]:
                 return False
             return simple_download(
                 url=file_info["url"],
@@ -111,11 +108,7 @@ class OpenXLabDrive(BaseDrive):
         file_list = self.get_file_list(dataset_name=dataset_name)
         for i, file in enumerate(file_list):
             filepath = os.path.join(dir_path, file["path"])
-            if (
-                os.path.exists(filepath)
-                and not overwrite
-                and file["size"] == os.path.getsize(filepath)
-            ):
+            if not overwrite and get_local_size(filepath) == file["size"]:
                 return False
             try:
                 self.download_file(
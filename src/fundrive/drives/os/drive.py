@@ -36,16 +36,16 @@ class OSDrive(BaseDrive):
 
     def get_file_list(self, path, *args, **kwargs) -> List[Dict[str, Any]]:
         result = []
-        for file in os.listdir(path):
-            file_path = os.path.join(path, file)
-            if os.path.isfile(file_path):
-                result.append({"path": file_path})
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    result.append({"path": entry.path})
         return result
 
     def get_dir_list(self, path, *args, **kwargs) -> List[Dict[str, Any]]:
         result = []
-        for file in os.listdir(path):
-            file_path = os.path.join(path, file)
-            if os.path.isdir(file_path):
-                result.append({"path": file_path})
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    result.append({"path": entry.path})
         return result
@@ -13,6 +13,7 @@ from funsecret import read_secret
 from tqdm import tqdm
 
 from fundrive.core import BaseDrive, DriveFile
+from fundrive.core.base import get_local_size
 
 
 def public_oss_url(
@@ -246,17 +247,12 @@ class OSSDrive(BaseDrive):
         Returns:
             bool: 下载是否成功
         """
-        if not os.path.exists(save_path):
-            os.makedirs(save_path)
+        os.makedirs(save_path, exist_ok=True)
 
         filename = os.path.basename(oss_path)
         file_path = os.path.join(save_path, filename)
 
-        if (
-            not overwrite
-            and os.path.exists(file_path)
-            and size == os.path.getsize(file_path)
-        ):
+        if not overwrite and get_local_size(file_path) == size:
             return False
 
         bar = tqdm(
@@ -293,8 +289,7 @@ class OSSDrive(BaseDrive):
         save_dir = (
             os.path.dirname(filepath) if os.path.splitext(filepath)[1] else filepath
         )
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
+        os.makedirs(save_dir, exist_ok=True)
 
         file_info = self.get_file_info(fid=fid)
         return self.__download_file(
@@ -324,7 +319,7 @@ class OSSDrive(BaseDrive):
         oss_path = os.path.join(fid, filename)
         size = os.path.getsize(filepath)
         file_info = self.get_file_info(oss_path)
-        if not overwrite and "size" in file_info.keys() and size == file_info["size"]:
+        if not overwrite and "size" in file_info and size == file_info["size"]:
             return False
         bar = tqdm(
             total=size,
@@ -1,7 +1,12 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List
 
+import orjson
 import requests
-from funget import simple_download
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
 
 from fundrive.core import BaseDrive
 
@@ -9,6 +14,11 @@ from fundrive.core import BaseDrive
 class TSingHuaDrive(BaseDrive):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=3),
+        )
 
     @staticmethod
     def __get_url(share_key=None, path=""):
@@ -18,38 +28,36 @@ class TSingHuaDrive(BaseDrive):
         self, share_key=None, path="", *args, **kwargs
     ) -> List[Dict[str, Any]]:
         result = []
-        with requests.Session() as sess:
-            r = sess.get(self.__get_url(share_key, path))
-            objects = r.json()["dirent_list"]
-            for obj in objects:
-                if obj["is_dir"]:
-                    result.append(
-                        {
-                            "name": obj["folder_name"],
-                            "time": obj["last_modified"],
-                            "size": obj["size"],
-                            "path": obj["folder_path"],
-                        }
-                    )
+        r = self.session.get(self.__get_url(share_key, path))
+        objects = orjson.loads(r.content)["dirent_list"]
+        for obj in objects:
+            if obj["is_dir"]:
+                result.append(
+                    {
+                        "name": obj["folder_name"],
+                        "time": obj["last_modified"],
+                        "size": obj["size"],
+                        "path": obj["folder_path"],
+                    }
+                )
         return result
 
     def get_file_list(
         self, share_key=None, path="", pwd=None, *args, **kwargs
     ) -> List[Dict[str, Any]]:
         result = []
-        with requests.Session() as sess:
-            r = sess.get(self.__get_url(share_key, path))
-            objects = r.json()["dirent_list"]
-            for obj in objects:
-                if not obj["is_dir"]:
-                    result.append(
-                        {
-                            "name": obj["file_name"],
-                            "time": obj["last_modified"],
-                            "size": obj["size"],
-                            "path": obj["file_path"],
-                        }
-                    )
+        r = self.session.get(self.__get_url(share_key, path))
+        objects = orjson.loads(r.content)["dirent_list"]
+        for obj in objects:
+            if not obj["is_dir"]:
+                result.append(
+                    {
+                        "name": obj["file_name"],
+                        "time": obj["last_modified"],
+                        "size": obj["size"],
+                        "path": obj["file_path"],
+                    }
+                )
         return result
 
     def download_file(
@@ -62,7 +70,30 @@ class TSingHuaDrive(BaseDrive):
         **kwargs,
     ) -> bool:
         file_url = f"https://cloud.tsinghua.edu.cn/d/{share_key}/files/?p={path}&dl=1"
-        return simple_download(url=file_url, filepath=f"{dir_path}/{path}")
+        filepath = f"{dir_path}/{path}"
+        if not overwrite and os.path.exists(filepath):
+            return False
+        return self._stream_to_file(file_url, filepath)
+
+    def _stream_to_file(self, url, filepath, chunk_size=1024 * 1024) -> bool:
+        # 复用session的keep-alive连接，先写入临时文件，完成后再改名
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        tmp_path = f"{filepath}.part"
+        with self.session.get(url, stream=True, timeout=60) as r:
+            r.raise_for_status()
+            total = int(r.headers.get("content-length", 0)) or None
+            with open(tmp_path, "wb", buffering=chunk_size) as f, tqdm(
+                total=total,
+                desc=os.path.basename(filepath),
+                unit="B",
+                unit_scale=True,
+                unit_divisor=1024,
+                mininterval=0.25,
+            ) as bar:
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    bar.update(f.write(chunk))
+        os.replace(tmp_path, filepath)
+        return True
 
     def download_dir(
         self,
@@ -70,29 +101,47 @@ class TSingHuaDrive(BaseDrive):
         overwrite=False,
         share_key=None,
         path="",
+        max_workers=8,
         *args,
         **kwargs,
     ) -> bool:
-        file_list = self.get_file_list(share_key=share_key, path=path)
-        dir_list = self.get_dir_list(share_key=share_key, path=path)
-
-        for file in file_list:
-            self.download_file(
-                dir_path=dir_path,
-                share_key=share_key,
-                path=file["path"],
-                overwrite=overwrite,
-            )
-        for file in dir_list:
-            self.download_dir(
-                dir_path=dir_path,
-                share_key=share_key,
-                path=file["path"],
-                overwrite=overwrite,
+        def list_dir(_path):
+            return (
+                self.get_file_list(share_key=share_key, path=_path),
+                self.get_dir_list(share_key=share_key, path=_path),
             )
+
+        # 目录列表使用独立的小线程池，不会排在已提交的下载任务之后
+        with ThreadPoolExecutor(max_workers=min(4, max_workers)) as list_executor:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_list = []
+                paths = [path]
+                # 按层遍历目录，文件下载在遍历的同时并发进行
+                while paths:
+                    sub_paths = []
+                    for file_list, dir_list in list_executor.map(list_dir, paths):
+                        for file in file_list:
+                            future_list.append(
+                                executor.submit(
+                                    self.download_file,
+                                    dir_path=dir_path,
+                                    share_key=share_key,
+                                    path=file["path"],
+                                    overwrite=overwrite,
+                                )
+                            )
+                        sub_paths.extend(file["path"] for file in dir_list)
+                    paths = sub_paths
+                for future in as_completed(future_list):
+                    future.result()
         return True
 
 
+@functools.lru_cache(maxsize=1)
+def _shared_drive() -> TSingHuaDrive:
+    return TSingHuaDrive()
+
+
 def download(
     share_key,
     dir_path=".cache",
@@ -102,7 +151,7 @@ def download(
     *args,
     **kwargs,
 ):
-    drive = TSingHuaDrive()
+    drive = _shared_drive()
     if is_dir:
         drive.download_dir(
             share_key=share_key,
@@ -1,9 +1,13 @@
 import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
 import orjson
 import requests
 from funsecret import read_secret
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from fundrive.core import BaseDrive
 
@@ -14,8 +18,29 @@ class GiteeDrive(BaseDrive):
         self.base_url = "https://gitee.com/api/v5"
         self.repo_str = None
         self.access_tokens = None
+        self.branch = None
+        # 目录树缓存: ref -> (获取时间, tree)，tree为None表示需要逐层遍历
+        self._tree_cache = {}
+        self._tree_cache_ttl = 30
+        # 已知文件sha: (repo_str, branch, git_path) -> sha，省去上传前的查询请求
+        self._sha_cache = {}
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(500, 502, 503, 504),
+                ),
+            ),
+        )
 
-    def login(self, repo_str, access_tokens=None, *args, **kwargs) -> bool:
+    def login(
+        self, repo_str, access_tokens=None, branch=None, *args, **kwargs
+    ) -> bool:
         access_tokens = access_tokens or read_secret(
             cate1="fundrive",
             cate2="drives",
@@ -24,6 +49,7 @@ class GiteeDrive(BaseDrive):
         )
         self.access_tokens = access_tokens
         self.repo_str = repo_str
+        self.branch = branch
         return True
 
     def get_dir_info(self, git_path, *args, **kwargs) -> Dict[str, Any]:
@@ -32,12 +58,36 @@ class GiteeDrive(BaseDrive):
             return data[0]
         return {}
 
-    def get_file_info(self, git_path, *args, **kwargs) -> Dict[str, Any]:
-        data = {"access_token": self.access_tokens}
-        res = requests.get(
-            f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}", data=data
+    def invalidate(self, git_path) -> None:
+        for key in [key for key in self._sha_cache if key[2] == git_path]:
+            self._sha_cache.pop(key, None)
+        self._tree_cache.clear()
+
+    def _default_branch(self):
+        # 未指定分支时使用仓库的默认分支，查询失败返回None
+        if self.branch is None:
+            params = {"access_token": self.access_tokens}
+            res = self.session.get(
+                f"{self.base_url}/repos/{self.repo_str}", params=params
+            )
+            if not res.ok:
+                return None
+            self.branch = orjson.loads(res.content).get("default_branch")
+        return self.branch
+
+    def _get_contents(self, git_path, ref=None) -> Any:
+        # 与目录树使用同一分支，保证递归与非递归列表一致
+        params = {"access_token": self.access_tokens}
+        ref = ref or self._default_branch()
+        if ref is not None:
+            params["ref"] = ref
+        res = self.session.get(
+            f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}", params=params
         )
-        data = res.json()
+        return orjson.loads(res.content)
+
+    def get_file_info(self, git_path, *args, ref=None, **kwargs) -> Dict[str, Any]:
+        data = self._get_contents(git_path, ref=ref)
         if len(data) == 0:
             return {}
         return {
@@ -47,48 +97,76 @@ class GiteeDrive(BaseDrive):
             "sha": data["sha"],
         }
 
-    def get_file_list(
-        self, git_path, recursive=False, *args, **kwargs
-    ) -> List[Dict[str, Any]]:
-        all_files = []
-        data = {"access_token": self.access_tokens}
-        res = requests.get(
-            f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}", data=data
+    def _list_tree(self, ref=None):
+        # 一次请求获取整个仓库的目录树，按ref缓存；请求失败或目录树被截断时返回None
+        ref = ref or self._default_branch()
+        if ref is None:
+            return None
+        now = time.monotonic()
+        cached = self._tree_cache.get(ref)
+        if cached is not None and now - cached[0] < self._tree_cache_ttl:
+            return cached[1]
+        params = {"access_token": self.access_tokens, "recursive": 1}
+        res = self.session.get(
+            f"{self.base_url}/repos/{self.repo_str}/git/trees/{ref}", params=params
         )
-        for data in res.json():
-            if data["type"] != "dir":
-                all_files.append(
-                    {
-                        "name": data["name"],
-                        "path": data["path"],
-                        "size": data["size"],
+        tree = None
+        if res.ok:
+            data = orjson.loads(res.content)
+            if isinstance(data, dict) and not data.get("truncated"):
+                tree = data.get("tree")
+        self._tree_cache[ref] = (now, tree)
+        return tree
+
+    def _walk_contents(self, git_path, recursive=False, max_workers=8):
+        paths = [git_path]
+        # 按层遍历，同一层的目录并发请求
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while paths:
+                sub_paths = []
+                for contents in executor.map(self._get_contents, paths):
+                    for data in contents:
+                        yield data
+                        if recursive and data["type"] == "dir":
+                            sub_paths.append(data["path"])
+                paths = sub_paths
+
+    def _iter_entries(self, git_path, recursive=False, max_workers=8):
+        if recursive:
+            tree = self._list_tree()
+            if tree is not None:
+                prefix = f"{git_path.strip('/')}/" if git_path.strip("/") else ""
+                for item in tree:
+                    if item["type"] not in ("tree", "blob"):
+                        continue
+                    if not item["path"].startswith(prefix):
+                        continue
+                    yield {
+                        "name": item["path"].rsplit("/", 1)[-1],
+                        "path": item["path"],
+                        "size": item.get("size", 0),
+                        "type": "dir" if item["type"] == "tree" else "file",
                     }
-                )
-            elif recursive:
-                all_files.extend(self.get_file_list(data["path"]))
-        return all_files
+                return
+        yield from self._walk_contents(git_path, recursive, max_workers)
+
+    def get_file_list(
+        self, git_path, recursive=False, max_workers=8, *args, **kwargs
+    ) -> List[Dict[str, Any]]:
+        return [
+            {"name": data["name"], "path": data["path"], "size": data["size"]}
+            for data in self._iter_entries(git_path, recursive, max_workers)
+            if data["type"] != "dir"
+        ]
 
     def get_dir_list(
-        self, git_path, recursive=False, *args, **kwargs
+        self, git_path, recursive=False, max_workers=8, *args, **kwargs
     ) -> List[Dict[str, Any]]:
-        all_files = []
-        data = {"access_token": self.access_tokens}
-        res = requests.get(
-            f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}", data=data
-        )
-        for data in res.json():
-            if data["type"] == "dir":
-                all_files.append(
-                    {
-                        "name": data["name"],
-                        "path": data["path"],
-                        "size": data["size"],
-                        # "time": datetime.strptime(last_modified, "%a, %d %b %Y %H:%M:%S %Z").strftime("%Y-%m-%d %H:%M:%S"),
-                    }
-                )
-                if recursive:
-                    all_files.extend(self.get_file_list(data["path"]))
-        return all_files
+        return [
+            {"name": data["name"], "path": data["path"], "size": data["size"]}
+            for data in self._iter_entries(git_path, recursive, max_workers)
+            if data["type"] == "dir"
+        ]
 
     def upload_file(
         self,
@@ -96,33 +174,44 @@ class GiteeDrive(BaseDrive):
         content=None,
         git_path=None,
         message="committing files",
-        branch="master",
+        branch=None,
         overwrite=False,
         *args,
         **kwargs,
     ) -> bool:
         if content is None:
-            content = open(file_path, "r").read()
-        if not isinstance(content, str):
-            content = orjson.dumps(content).decode("utf-8")
+            with open(file_path, "rb") as f:
+                content = f.read()
+        elif isinstance(content, str):
+            content = content.encode("utf-8")
+        elif not isinstance(content, bytes):
+            content = orjson.dumps(content)
 
+        # 默认上传到登录时的分支，查询失败时由服务端决定
+        branch = branch or self._default_branch()
         data = {
             "message": message,
-            "content": base64.b64encode(content.encode("utf-8")).decode(),
-            "branch": branch,
+            "content": base64.b64encode(content).decode(),
             "access_token": self.access_tokens,
         }
-        info = self.get_file_info(git_path=git_path)
-        if len(info) == 0:
-            res = requests.post(
+        if branch is not None:
+            data["branch"] = branch
+        key = (self.repo_str, branch, git_path)
+        sha = self._sha_cache.get(key)
+        if sha is None:
+            sha = self.get_file_info(git_path=git_path, ref=branch).get("sha")
+        if sha is None:
+            res = self.session.post(
                 f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}", json=data
             )
         else:
-            data["sha"] = info["sha"]
-            res = requests.put(
+            data["sha"] = sha
+            res = self.session.put(
                 f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}", json=data
             )
-        if res is None:
-            return True
-
+        self._tree_cache.pop(branch, None)
+        if not res.ok:
+            self._sha_cache.pop(key, None)
+        res.raise_for_status()
+        self._sha_cache[key] = orjson.loads(res.content)["content"]["sha"]
         return True
@@ -117,13 +117,16 @@ class GithubDrive(BaseDrive):
     ) -> bool:
         uri = f"{self.base_url}/repos/{self.repo_str}/contents/{git_path}"
         if content is None:
-            content = open(file_path, "r").read()
-        if not isinstance(content, str):
-            content = orjson.dumps(content).decode("utf-8")
+            with open(file_path, "rb") as f:
+                content = f.read()
+        elif isinstance(content, str):
+            content = content.encode("utf-8")
+        elif not isinstance(content, bytes):
+            content = orjson.dumps(content)
 
         data = {
             "message": message,
-            "content": base64.b64encode(content.encode("utf-8")).decode(),
+            "content": base64.b64encode(content).decode(),
             "branch": branch,
         }
         exist_info = self.get_file_info(git_path)